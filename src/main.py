@@ -1,16 +1,40 @@
 # src/main.py
+import atexit
+import csv
+import functools
 import logging
+import logging.handlers
 import os
-from typing import Optional
+import queue
+import stat
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional, Set, Tuple
 
 import numpy as np
+import numpy.typing as npt
 import pandas as pd
 
+try:  # Optional: pushes the value1 filter down into the CSV scan and writes CSV output in C.
+    import pyarrow as pa  # type: ignore[import-untyped]
+    import pyarrow.csv as pa_csv  # type: ignore[import-untyped]
+    import pyarrow.dataset as pa_ds  # type: ignore[import-untyped]
+    import pyarrow.fs as pa_fs  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - pyarrow is an optional extra
+    pa = pa_csv = pa_ds = pa_fs = None
+
+njit: Optional[Callable[..., Any]]
+try:  # Optional: compiles the per-row transformation kernel to machine code.
+    from numba import njit  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - numba is an optional extra
+    njit = None
+
 # --- Determine Project Root ---
 # This is defined once at the module level
 # When testing, your test fixture (temp_data_dir) will monkeypatch THIS variable
 # in the 'main_module' object.
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Resolved once (a single realpath, symlinks normalised) and kept as a str for the os.path helpers below.
+PROJECT_ROOT = str(Path(__file__).resolve(strict=True).parent.parent)
 
 
 # --- Helper functions to dynamically get default paths ---
@@ -28,20 +52,177 @@ def get_default_log_path() -> str:
     return os.path.join(PROJECT_ROOT, "data", "data_processing.log")
 
 
+# Directories already created by _ensure_dir during this process.
+# Keyed by path (not a single flag) so a patched PROJECT_ROOT still gets its own directory.
+_ensured_dirs: Set[str] = set()
+
+
+def _ensure_dir(dir_path: str) -> None:
+    """Creates dir_path once per process, skipping the mkdir syscall on repeat calls."""
+    if dir_path in _ensured_dirs:
+        return
+    Path(dir_path).mkdir(parents=True, exist_ok=True)
+    _ensured_dirs.add(dir_path)
+
+
+# Schema of the input CSV. Passing it to the readers skips per-column type inference;
+# any other columns in the file are not read. The integer columns are nullable, so a blank field reads
+# as NA (as it does through pyarrow) instead of failing the whole read. category is a plain string:
+# process_data turns every column into a NumPy array when filtering, so a categorical dtype would be discarded.
+_INPUT_SCHEMA: Dict[str, Any] = {"id": "Int64", "category": str, "value1": "Int64", "value2": np.float64}
+_INPUT_COLUMNS = list(_INPUT_SCHEMA)
+
+# Default transformation parameters for process_data: rows with value1 <= VALUE1_MIN are dropped, rows with
+# value1 > VALUE1_HIGH are labelled "High", and DIVISION_EPSILON keeps value2 / value1 finite when value1 is 0.
+VALUE1_MIN = 20
+VALUE1_HIGH = 35
+DIVISION_EPSILON = 1e-6
+
+
+def _read_input_csv(path: str, value1_min: float) -> pd.DataFrame:
+    """
+    Reads the input CSV. With pyarrow installed, rows with value1 <= value1_min are dropped
+    during the scan so they are never materialised in pandas.
+    """
+    if pa_ds is None:
+        df: pd.DataFrame = pd.read_csv(path, dtype=_INPUT_SCHEMA, usecols=_INPUT_COLUMNS, engine="c", memory_map=True)
+        return df
+    column_types = {"id": pa.int64(), "category": pa.string(), "value1": pa.int64(), "value2": pa.float64()}
+    csv_format = pa_ds.CsvFileFormat(convert_options=pa_csv.ConvertOptions(column_types=column_types))
+    # Memory-map the file like the pandas reader above, parsing from the page cache without a read-buffer copy.
+    filesystem = pa_fs.LocalFileSystem(use_mmap=True)
+    logger.debug("pyarrow reader drops rows with value1 <= %s while scanning.", value1_min)
+    table = pa_ds.dataset(path, format=csv_format, filesystem=filesystem).to_table(columns=_INPUT_COLUMNS, filter=pa_ds.field("value1") > value1_min)
+    arrow_df: pd.DataFrame = table.to_pandas(types_mapper=pd.ArrowDtype)
+    return arrow_df
+
+
+# Categories for 'value1_type'; the 0/1 "is high" flag returned by the transformation is used directly as the code.
+_VALUE1_TYPE_CATEGORIES = pd.Index(["Medium", "High"])
+
+TransformOutput = Tuple[np.ndarray, npt.NDArray[np.float64], npt.NDArray[np.uint8]]
+
+
+TransformFn = Callable[[np.ndarray, np.ndarray], TransformOutput]
+
+
+def _make_transform_kernel(high_threshold: float, epsilon: float) -> TransformFn:
+    """Builds the loop kernel with the thresholds baked in as closure constants."""
+
+    def kernel(v1: np.ndarray, v2: np.ndarray) -> TransformOutput:
+        """Derives value1_plus_10, value2_div_value1 and the value1_type flag in a single loop over the filtered rows."""
+        n = v1.size
+        plus_10 = np.empty(n, dtype=v1.dtype)
+        ratio = np.empty(n, dtype=np.float64)
+        is_high = np.empty(n, dtype=np.uint8)
+        for i in range(n):
+            plus_10[i] = v1[i] + 10
+            ratio[i] = v2[i] / (v1[i] + epsilon)
+            is_high[i] = 1 if v1[i] > high_threshold else 0
+        return plus_10, ratio, is_high
+
+    return kernel
+
+
+def _make_transform_numpy(high_threshold: float, epsilon: float) -> TransformFn:
+    """Builds the vectorised NumPy equivalent of the loop kernel, used when numba is not installed."""
+
+    def transform(v1: np.ndarray, v2: np.ndarray) -> TransformOutput:
+        return v1 + 10, v2 / (v1 + epsilon), (v1 > high_threshold).astype(np.uint8)
+
+    return transform
+
+
+@functools.lru_cache(maxsize=16)
+def _make_transform(high_threshold: float, epsilon: float) -> TransformFn:
+    """
+    Returns the transformation for one (high_threshold, epsilon) pair, built once per pair.
+
+    With numba the thresholds are compile-time constants, so LLVM can fold them into the loop;
+    cache=True keeps each specialisation on disk so only the first run pays the JIT cost.
+    """
+    if njit is None:
+        return _make_transform_numpy(high_threshold, epsilon)
+    return njit(cache=True)(_make_transform_kernel(high_threshold, epsilon))  # type: ignore[no-any-return]
+
+
 # --- Configure Logging ---
 logger = logging.getLogger(__name__)  # Get logger instance for this module
 
 
-def setup_logging():
-    """Configures the logging for the application."""
+class CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that renders the date/time part of asctime at most once per second.
+
+    Records logged within the same second reuse the cached string and only the
+    milliseconds are formatted, so the output matches logging.Formatter exactly.
+    """
+
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None) -> None:
+        super().__init__(fmt, datefmt)
+        self._cached_time: Tuple[int, str] = (-1, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = int(record.created)
+        cached_second, time_str = self._cached_time
+        if second != cached_second:
+            time_str = time.strftime(datefmt or self.default_time_format, self.converter(second))
+            self._cached_time = (second, time_str)
+        if datefmt:
+            return time_str
+        if self.default_msec_format:  # Same guard as logging.Formatter.formatTime
+            return self.default_msec_format % (time_str, record.msecs)
+        return time_str
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler that lets records accumulate in a large write buffer instead of flushing
+    after every record, so many records share one write() syscall.
+
+    The buffer is written out when it fills, on flush()/close(), and by logging's own
+    shutdown hook at interpreter exit.
+    """
+
+    def __init__(self, filename: str, buffer_size: int = 1 << 16) -> None:
+        self.buffer_size = buffer_size
+        super().__init__(filename, encoding="utf-8")
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size, encoding=self.encoding)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Same as StreamHandler.emit, minus the per-record flush.
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+def setup_logging() -> Optional[logging.handlers.QueueListener]:
+    """
+    Configures the logging for the application and returns the started QueueListener
+    (None if this module's logger or the root logger already has handlers).
+
+    The file and console handlers run on a background QueueListener thread. The only handler
+    in the main thread is a QueueHandler installed on the root logger via basicConfig, so each
+    record passes through one handler and a log call is just an enqueue.
+    """
+    # hasHandlers() also looks at the root logger, so this returns early if this module or the root
+    # is already configured (a repeat call, pytest's capture handlers). basicConfig below therefore
+    # only ever runs against an unconfigured root and needs no force=True.
+    if logger.hasHandlers():
+        return None
+
     log_file_path = get_default_log_path()  # Use helper to get current log path
-    log_dir = os.path.dirname(log_file_path)
-    os.makedirs(log_dir, exist_ok=True)
+    _ensure_dir(os.path.dirname(log_file_path))
 
-    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    formatter = CachedTimeFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 
     # File Handler
-    file_handler = logging.FileHandler(log_file_path)
+    file_handler = BufferedFileHandler(log_file_path)
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
 
@@ -50,96 +231,242 @@ def setup_logging():
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(formatter)
 
-    # Add handlers to the logger if they haven't been added already
-    # This prevents duplicate handlers if setup_logging is called multiple times (e.g., in tests)
-    if not logger.hasHandlers():
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()  # Local annotations are never evaluated, so this is safe on 3.8
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # Drop records no handler would emit before they are enqueued.
+    queue_handler.setLevel(min(file_handler.level, console_handler.level))
+    # "%(message)s" only merges the args into the message before enqueueing; the listener's
+    # handlers apply the real format. The root stays at WARNING so third-party debug/info
+    # logging (e.g. numba compiling the kernel) stays out of the log; this module's records
+    # still reach the root handler through propagation.
+    logging.basicConfig(level=logging.WARNING, format="%(message)s", handlers=[queue_handler])
+
+    listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # Flushes queued records before the interpreter exits
 
-    logger.setLevel(logging.DEBUG)  # Set overall logger level
-    logger.propagate = False  # Avoid duplicate logs from root logger
+    logger.setLevel(logging.DEBUG)  # Set this module's logger level; its records propagate to the root handler
+    return listener
 
 
 # --- create_sample_dataframe (no changes needed other than using the existing logger) ---
+# Module-level Generator (PCG64); cheaper per draw than the legacy global np.random functions.
+_RNG = np.random.default_rng()
+
+
 def create_sample_dataframe() -> pd.DataFrame:
     """Generates a sample Pandas DataFrame for demonstration."""
     logger.debug("Creating sample DataFrame.")
+    # Columns are built with their final dtypes so pandas has nothing to infer, and
+    # copy=False lets the DataFrame take ownership of the freshly allocated arrays.
     data = {
-        "id": range(1, 6),
-        "category": ["A", "B", "A", "C", "B"],
-        "value1": np.random.randint(10, 50, size=5),
-        "value2": np.random.rand(5) * 100,
+        "id": np.arange(1, 6, dtype=np.int64),
+        "category": pd.Categorical(["A", "B", "A", "C", "B"], categories=["A", "B", "C"]),
+        "value1": _RNG.integers(10, 50, size=5, dtype=np.int64),
+        "value2": _RNG.random(5) * 100,
     }
-    df = pd.DataFrame(data)
-    logger.debug(f"Sample DataFrame created with {len(df)} rows.")
+    df = pd.DataFrame(data, copy=False)
+    logger.debug("Sample DataFrame created with %d rows.", len(df))
     return df
 
 
+# --- process_data result cache ---
+# Processed results keyed by the input's path, mtime and size plus the thresholds, so rewriting the file
+# or changing a threshold gets a fresh entry. Once the cache is full the oldest entry is evicted first.
+_RESULT_CACHE_MAX_ENTRIES = 8
+
+
+class _CacheKey(NamedTuple):
+    path: str
+    st_mtime_ns: int
+    st_size: int
+    value1_min: float
+    value1_high: float
+    epsilon: float
+
+
+_result_cache: Dict[_CacheKey, pd.DataFrame] = {}
+
+
+def _stat_key(path: str, value1_min: float, value1_high: float, epsilon: float) -> Optional[_CacheKey]:
+    """Returns the cache key for path and the thresholds, or None if path is not an existing regular file."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return _CacheKey(path, st.st_mtime_ns, st.st_size, value1_min, value1_high, epsilon)
+
+
+def _cached_result(key: Optional[_CacheKey]) -> Optional[pd.DataFrame]:
+    """Returns a copy of the cached result for key, or None if there is none."""
+    if key is None or key not in _result_cache:
+        return None
+    # Deep copy: without pandas copy-on-write, an in-place edit of a shallow copy would alter the cached frame.
+    return _result_cache[key].copy(deep=True)
+
+
+def _store_result(key: Optional[_CacheKey], df: pd.DataFrame) -> None:
+    """Caches a copy of df under key, evicting the oldest entry once the cache is full."""
+    if key is None:
+        return
+    if len(_result_cache) >= _RESULT_CACHE_MAX_ENTRIES:
+        del _result_cache[next(iter(_result_cache))]  # dicts keep insertion order, so this is the oldest
+    _result_cache[key] = df.copy(deep=True)
+
+
+def _masked_columns(df: pd.DataFrame, mask: np.ndarray) -> Dict[str, Any]:
+    """Returns each column of df as a NumPy array holding only the rows selected by mask."""
+    columns: Dict[str, Any] = {}
+    for col in df.columns:
+        if col == "value2":
+            # Plain float64 (nulls -> NaN) so the transformation kernel always gets a numeric array.
+            columns[col] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)[mask]
+        elif col == "value1":
+            # The fill value never survives: NA rows are always outside mask.
+            columns[col] = df[col].to_numpy(dtype=np.int64, na_value=0)[mask]
+        else:
+            columns[col] = df[col].to_numpy()[mask]
+    return columns
+
+
 # --- process_data (modified to use dynamic default paths) ---
-def process_data(input_csv_path: Optional[str] = None) -> pd.DataFrame:
+def process_data(
+    input_csv_path: Optional[str] = None,
+    value1_min: float = VALUE1_MIN,
+    value1_high: float = VALUE1_HIGH,
+    epsilon: float = DIVISION_EPSILON,
+) -> Optional[pd.DataFrame]:
     """
     Reads data from a CSV or generates sample data if not found,
     performs transformations, and returns the processed DataFrame.
+
+    Rows with value1 <= value1_min are dropped, rows with value1 > value1_high are labelled
+    "High", and epsilon is added to value1 before dividing value2 by it.
+
+    Returns None, without building a result DataFrame, when the input cannot be read or
+    no rows pass the value1 filter (including empty input).
     """
     # Dynamically get the default input path using the current (possibly patched) PROJECT_ROOT
     current_default_input_path = get_default_input_path()
 
-    # Ensure data directory exists (uses current PROJECT_ROOT)
-    data_dir = os.path.join(PROJECT_ROOT, "data")
-    os.makedirs(data_dir, exist_ok=True)
-
     effective_input_path = input_csv_path if input_csv_path else current_default_input_path
 
+    # A single stat both checks that the input exists and keys the result cache.
+    cache_key = _stat_key(effective_input_path, value1_min, value1_high, epsilon)
+    cached = _cached_result(cache_key)
+    if cached is not None:
+        logger.info("Input file '%s' is unchanged; reusing the cached result.", effective_input_path)
+        return cached
+
+    # Zero-byte input is caught from the stat result instead of letting the reader raise for it.
+    if cache_key is not None and cache_key.st_size == 0:
+        logger.error("Input file '%s' is empty. Cannot process.", effective_input_path)
+        return None
+
     try:
-        if os.path.exists(effective_input_path):
-            logger.info(f"Reading data from: {effective_input_path}")
-            df = pd.read_csv(effective_input_path)
+        if cache_key is not None:
+            logger.info("Reading data from: %s", effective_input_path)
+            df = _read_input_csv(effective_input_path, value1_min)
         else:
-            logger.warning(f"Input file '{effective_input_path}' not found. Generating sample data.")
+            logger.warning("Input file '%s' not found. Generating sample data.", effective_input_path)
             df = create_sample_dataframe()
-            # Save to the current_default_input_path, which reflects patched PROJECT_ROOT in tests
+            # Save to the current_default_input_path, which reflects patched PROJECT_ROOT in tests.
+            # This is the only place process_data writes, so the data directory is only ensured here.
+            _ensure_dir(os.path.dirname(current_default_input_path))
             df.to_csv(current_default_input_path, index=False)
-            logger.info(f"Sample data generated and saved to: {current_default_input_path}")
-    except pd.errors.EmptyDataError:
-        logger.error(f"Input file '{effective_input_path}' is empty. Cannot process.")
-        return pd.DataFrame()
+            logger.info("Sample data generated and saved to: %s", current_default_input_path)
+    except pd.errors.EmptyDataError:  # e.g. a file holding only blank lines
+        logger.error("Input file '%s' is empty. Cannot process.", effective_input_path)
+        return None
     except Exception as e:
         logger.error(
-            f"Error reading or generating input data from '{effective_input_path}': {e}",
+            "Error reading or generating input data from '%s': %s",
+            effective_input_path,
+            e,
             exc_info=True,
         )
-        return pd.DataFrame()
+        return None
 
-    if df.empty:  # Handle case where df might be empty after read/generation before transformations
-        logger.info("Input DataFrame is empty. No transformations will be applied.")
-        return df
-
-    logger.info("Original DataFrame head:")
-    logger.info(f"\n{df.head().to_string()}")
+    # Rendering a DataFrame is expensive, so only do it when INFO records are actually emitted.
+    # This is the frame as loaded: the pyarrow reader has already dropped rows failing the value1 filter.
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Input DataFrame head (as loaded):")
+        logger.info("\n%s", df.head().to_string())
 
     # Perform transformations:
+    # Work on the raw NumPy arrays and filter before deriving columns, so the new columns are
+    # only computed for the surviving rows and the result is built in a single DataFrame allocation.
     logger.debug("Starting transformations.")
-    df["value1_plus_10"] = df["value1"] + 10
+    # NA value1 compares as NaN > value1_min, i.e. False, so those rows are dropped like pyarrow's filter drops nulls.
+    mask = df["value1"].to_numpy(dtype=np.float64, na_value=np.nan) > value1_min
+    columns = _masked_columns(df, mask)
+    v1 = columns["value1"]
+    logger.debug("Filtered DataFrame, %d rows remaining.", len(v1))
+    if not len(v1):
+        # Checked after filtering (not on the loaded frame) so empty input and input the pyarrow
+        # reader filtered down to nothing end up here the same way as with the pandas reader.
+        logger.info("No rows with value1 > %s. No transformations will be applied.", value1_min)
+        return None
+
+    # Built (and, with numba, compiled) once per threshold pair; later calls hit the lru_cache.
+    transform = _make_transform(value1_high, epsilon)
+    plus_10, ratio, is_high = transform(v1, columns["value2"])
+    columns["value1_plus_10"] = plus_10
     logger.debug("Added 'value1_plus_10' column.")
 
-    df["value2_div_value1"] = df["value2"] / (df["value1"] + 1e-6)
+    columns["value2_div_value1"] = ratio
     logger.debug("Added 'value2_div_value1' column.")
 
-    df_filtered = df[df["value1"] > 20].copy()
-    logger.debug(f"Filtered DataFrame, {len(df_filtered)} rows remaining.")
+    # Categorical: one byte per row instead of an object pointer to a Python string.
+    columns["value1_type"] = pd.Categorical.from_codes(is_high, categories=_VALUE1_TYPE_CATEGORIES)
+    logger.debug("Added 'value1_type' column.")
+
+    # The masked arrays are already fresh copies owned by us, so let the DataFrame adopt them as-is.
+    df_filtered = pd.DataFrame(columns, copy=False)
 
-    if not df_filtered.empty:  # Only add 'value1_type' if df_filtered is not empty
-        df_filtered["value1_type"] = np.where(df_filtered["value1"] > 35, "High", "Medium")
-        logger.debug("Added 'value1_type' column.")
-    else:
-        logger.debug("DataFrame became empty after filtering; 'value1_type' column not added.")
+    _store_result(cache_key, df_filtered)
 
-    logger.info("Processed DataFrame head (after filtering and adding 'value1_type'):")
-    logger.info(f"\n{df_filtered.head().to_string()}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Processed DataFrame head (after filtering and adding 'value1_type'):")
+        logger.info("\n%s", df_filtered.head().to_string())
 
     return df_filtered
 
 
+def _write_csv_pyarrow(df: pd.DataFrame, output_csv_path: str) -> None:
+    """
+    Writes df with pyarrow's C writer, byte-for-byte as DataFrame.to_csv(index=False) would.
+    Raises pyarrow.ArrowInvalid if a field contains a delimiter, quote or newline.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, col in enumerate(df.columns):
+        if pd.api.types.is_float_dtype(df[col].dtype):
+            # Render floats as to_csv does (ndarray.astype(str), NaN as an empty field); pyarrow's own formatting differs.
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            table = table.set_column(i, str(col), pa.array(values.astype(str), mask=np.isnan(values)))
+    with open(output_csv_path, "w", newline="") as header_file:
+        csv.writer(header_file, lineterminator="\n").writerow(df.columns)
+    with open(output_csv_path, "ab") as body_file:
+        # quoting_style="none" matches to_csv's minimal quoting for every field that needs none, and raises otherwise.
+        pa_csv.write_csv(table, body_file, write_options=pa_csv.WriteOptions(include_header=False, quoting_style="none"))
+
+
+def save_processed_data(df: pd.DataFrame, output_csv_path: str) -> None:
+    """
+    Writes the processed DataFrame to CSV, using pyarrow's C writer when it is installed.
+    The file is the same whichever writer produces it.
+    """
+    if pa_csv is not None:
+        try:
+            _write_csv_pyarrow(df, output_csv_path)
+            return
+        except pa.ArrowInvalid:
+            logger.debug("Output has fields that need quoting; writing it with pandas instead.")
+    df.to_csv(output_csv_path, index=False, lineterminator="\n")
+
+
 # --- Main execution block ---
 if __name__ == "__main__":  # pragma: no cover
     setup_logging()  # Call the logging setup function once.
@@ -149,19 +476,19 @@ if __name__ == "__main__":  # pragma: no cover
     default_input_for_script = get_default_input_path()
     default_output_for_script = get_default_output_path()
 
-    # Ensure output directory exists (process_data also does this for its needs)
-    os.makedirs(os.path.dirname(default_output_for_script), exist_ok=True)
+    # Ensure output directory exists; it is the data directory setup_logging already created, so this is a set lookup
+    _ensure_dir(os.path.dirname(default_output_for_script))
 
     try:
         processed_df = process_data(default_input_for_script)
 
-        if not processed_df.empty:
-            processed_df.to_csv(default_output_for_script, index=False)
-            logger.info(f"Processed data successfully saved to: {default_output_for_script}")
+        if processed_df is None:
+            logger.info("No data to save after processing (no rows passed the filter or an error occurred).")
         else:
-            logger.info("No data to save after processing (DataFrame was empty or error occurred).")
+            save_processed_data(processed_df, default_output_for_script)
+            logger.info("Processed data successfully saved to: %s", default_output_for_script)
     except Exception as e:
-        logger.critical(f"An unhandled error occurred during script execution: {e}", exc_info=True)
+        logger.critical("An unhandled error occurred during script execution: %s", e, exc_info=True)
         # import sys
         # sys.exit(1) # Consider exiting with an error code for critical failures
 
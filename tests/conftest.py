@@ -0,0 +1,18 @@
+# tests/conftest.py
+import logging
+
+import pytest
+
+import main as main_module
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _silence_logging():
+    """Installs a single NullHandler for the whole test run instead of per-test file/console handlers."""
+    null_handler = logging.NullHandler()
+    previous_level = main_module.logger.level
+    main_module.logger.addHandler(null_handler)
+    main_module.logger.setLevel(logging.CRITICAL)
+    yield
+    main_module.logger.setLevel(previous_level)
+    main_module.logger.removeHandler(null_handler)
@@ -1,7 +1,12 @@
 # tests/test_main.py
+import atexit
+import logging
+import logging.handlers
 import os
+import re
 import tempfile
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -28,11 +33,7 @@ def temp_data_dir(monkeypatch):  # Pytest's built-in monkeypatch fixture.
     """Creates a temporary directory for data files during tests and cleans up."""
     with tempfile.TemporaryDirectory() as tmpdir_path:
         monkeypatch.setattr(main_module, "PROJECT_ROOT", tmpdir_path)
-        # Also patch the log file path if it's defined globally in main_module
-        # and you want test logs to go to a temp location or be suppressed.
-        # For simplicity now, we'll let it use the patched PROJECT_ROOT
-        # which means test logs would go into temp_data_dir/data/data_processing.log
-        # Alternatively, you could disable file logging during tests.
+        # No log file is written here: conftest.py silences the module logger for the whole session.
         yield tmpdir_path
 
 
@@ -42,35 +43,41 @@ def test_create_sample_dataframe():
     assert not df.empty
     assert list(df.columns) == ["id", "category", "value1", "value2"]
     assert len(df) == 5
+    assert isinstance(df["category"].dtype, pd.CategoricalDtype)
 
 
 def test_process_data_with_input_file(sample_df_for_test: pd.DataFrame, temp_data_dir: str):
-    # Setup logging for the test context if not already configured by main execution
-    # This is only needed if tests run main.py as a script vs importing functions.
-    # Our current setup imports functions, and logging is configured when main.py runs.
-    # However, to ensure logging is active during test of process_data:
-    if not main_module.logger.hasHandlers():  # Check if handlers are already set
-        main_module.setup_logging()  # Call setup if not configured
-
     test_input_csv_path = os.path.join(temp_data_dir, "data", "test_input.csv")
     os.makedirs(os.path.dirname(test_input_csv_path), exist_ok=True)
     sample_df_for_test.to_csv(test_input_csv_path, index=False)
 
     processed_df = process_data(test_input_csv_path)
 
+    assert processed_df is not None
     assert not processed_df.empty
     assert "value1_plus_10" in processed_df.columns
     expected_ids_after_filter = [2, 3, 4]
     assert processed_df["id"].tolist() == expected_ids_after_filter
     expected_types = ["Medium", "Medium", "High"]
     assert processed_df["value1_type"].tolist() == expected_types
+    assert isinstance(processed_df["value1_type"].dtype, pd.CategoricalDtype)
 
 
-def test_process_data_generates_sample_if_no_input(temp_data_dir: str):
-    if not main_module.logger.hasHandlers():
-        main_module.setup_logging()
+def test_process_data_with_custom_thresholds(sample_df_for_test: pd.DataFrame, temp_data_dir: str):
+    test_input_csv_path = os.path.join(temp_data_dir, "data", "threshold_input.csv")
+    os.makedirs(os.path.dirname(test_input_csv_path), exist_ok=True)
+    sample_df_for_test.to_csv(test_input_csv_path, index=False)
+
+    processed_df = process_data(test_input_csv_path, value1_min=10, value1_high=30)
+
+    assert processed_df is not None
+    assert processed_df["id"].tolist() == [1, 2, 3, 4]
+    assert processed_df["value1_type"].tolist() == ["Medium", "Medium", "High", "High"]
 
+
+def test_process_data_generates_sample_if_no_input(temp_data_dir: str):
     processed_df = process_data("non_existent_file.csv")
+    assert processed_df is not None
     assert not processed_df.empty
     assert "value1_plus_10" in processed_df.columns
     generated_input_path = os.path.join(temp_data_dir, "data", "sample_input.csv")
@@ -78,9 +85,6 @@ def test_process_data_generates_sample_if_no_input(temp_data_dir: str):
 
 
 def test_process_data_handles_empty_input_file(temp_data_dir: str):
-    if not main_module.logger.hasHandlers():
-        main_module.setup_logging()
-
     empty_csv_path = os.path.join(temp_data_dir, "data", "empty_input.csv")
     os.makedirs(os.path.dirname(empty_csv_path), exist_ok=True)
     with open(empty_csv_path, "w") as f:
@@ -88,4 +92,173 @@ def test_process_data_handles_empty_input_file(temp_data_dir: str):
         # For true EmptyDataError: f.write("col1,col2\n") # just headers
 
     processed_df = process_data(empty_csv_path)
-    assert processed_df.empty  # Expect an empty DataFrame due to EmptyDataError handling
+    assert processed_df is None  # Empty input short-circuits without building a DataFrame
+
+
+def test_process_data_all_rows_filtered_matches_across_readers(sample_df_for_test: pd.DataFrame, temp_data_dir: str, monkeypatch):
+    low_values_df = sample_df_for_test[sample_df_for_test["value1"] <= 20]
+    blank_value1_row = pd.DataFrame({"id": [6], "category": ["X"], "value1": [pd.NA], "value2": [60.0]})
+    low_values_df = pd.concat([low_values_df, blank_value1_row]).astype({"value1": "Int64"})
+    for reader_name, reader in (("pyarrow", main_module.pa_ds), ("pandas", None)):
+        monkeypatch.setattr(main_module, "pa_ds", reader)
+        test_input_csv_path = os.path.join(temp_data_dir, "data", f"all_filtered_{reader_name}.csv")
+        os.makedirs(os.path.dirname(test_input_csv_path), exist_ok=True)
+        low_values_df.to_csv(test_input_csv_path, index=False)
+        assert process_data(test_input_csv_path) is None
+
+
+def test_process_data_drops_blank_value1_across_readers(temp_data_dir: str, monkeypatch):
+    results = {}
+    for reader_name, reader in (("pyarrow", main_module.pa_ds), ("pandas", None)):
+        monkeypatch.setattr(main_module, "pa_ds", reader)
+        test_input_csv_path = os.path.join(temp_data_dir, "data", f"blank_value1_{reader_name}.csv")
+        os.makedirs(os.path.dirname(test_input_csv_path), exist_ok=True)
+        with open(test_input_csv_path, "w") as f:
+            f.write("id,category,value1,value2\n1,A,,1.0\n2,B,40,3.0\n3,C,25,2.0\n")
+        results[reader_name] = process_data(test_input_csv_path)
+    for processed_df in results.values():
+        assert processed_df is not None
+        assert processed_df["id"].tolist() == [2, 3]
+        assert processed_df["value1_type"].tolist() == ["High", "Medium"]
+
+
+def test_transform_kernel_matches_numpy_fallback():
+    v1 = np.array([25, 36, 21, 50], dtype=np.int64)
+    v2 = np.array([10.0, 20.0, 30.0, 40.0])
+    for high_threshold in (35, 22):
+        reference = main_module._make_transform_numpy(high_threshold, 1e-6)
+        kernels = (main_module._make_transform(high_threshold, 1e-6), main_module._make_transform_kernel(high_threshold, 1e-6))
+        for kernel in kernels:
+            plus_10, ratio, is_high = kernel(v1, v2)
+            expected_plus_10, expected_ratio, expected_is_high = reference(v1, v2)
+            np.testing.assert_array_equal(plus_10, expected_plus_10)
+            np.testing.assert_allclose(ratio, expected_ratio)
+            np.testing.assert_array_equal(is_high, expected_is_high)
+
+
+def test_buffered_file_handler_writes_on_flush(tmp_path):
+    log_path = tmp_path / "buffered.log"
+    handler = main_module.BufferedFileHandler(str(log_path))
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    try:
+        handler.emit(logging.makeLogRecord({"msg": "first record"}))
+        assert log_path.read_text() == ""  # Still sitting in the write buffer
+        handler.flush()
+        assert log_path.read_text() == "first record\n"
+    finally:
+        handler.close()
+
+
+def test_cached_time_formatter_matches_standard_formatter():
+    fmt = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    cached, standard = main_module.CachedTimeFormatter(fmt), logging.Formatter(fmt)
+    for created in (1700000000.123, 1700000000.987, 1700000001.004):
+        record = logging.makeLogRecord({"msg": "hello", "created": created, "msecs": (created % 1) * 1000})
+        assert cached.format(record) == standard.format(record)
+
+    cached.default_msec_format = standard.default_msec_format = None
+    assert cached.format(record) == standard.format(record)
+
+
+def test_process_data_caches_result_until_input_changes(sample_df_for_test: pd.DataFrame, temp_data_dir: str, monkeypatch):
+    test_input_csv_path = os.path.join(temp_data_dir, "data", "cached_input.csv")
+    os.makedirs(os.path.dirname(test_input_csv_path), exist_ok=True)
+    sample_df_for_test.to_csv(test_input_csv_path, index=False)
+
+    reads = []
+    real_read = main_module._read_input_csv
+
+    def spy_read(path: str, value1_min: float) -> pd.DataFrame:
+        reads.append(path)
+        return real_read(path, value1_min)
+
+    monkeypatch.setattr(main_module, "_read_input_csv", spy_read)
+
+    first = process_data(test_input_csv_path)
+    second = process_data(test_input_csv_path)
+    assert len(reads) == 1
+    assert first is not None
+    assert second is not None
+    pd.testing.assert_frame_equal(first, second)
+    second.loc[0, "value2"] = -1.0  # Editing a returned frame must not change the cached result
+    cached_again = process_data(test_input_csv_path)
+    assert cached_again is not None
+    pd.testing.assert_frame_equal(first, cached_again)
+
+    sample_df_for_test.iloc[:2].to_csv(test_input_csv_path, index=False)  # Changes size and mtime
+    third = process_data(test_input_csv_path)
+    assert len(reads) == 2
+    assert third is not None
+    assert third["id"].tolist() == [2]
+
+
+def test_save_processed_data_matches_pandas_writer(sample_df_for_test: pd.DataFrame, temp_data_dir: str, monkeypatch):
+    test_input_csv_path = os.path.join(temp_data_dir, "data", "save_input.csv")
+    os.makedirs(os.path.dirname(test_input_csv_path), exist_ok=True)
+    sample_df_for_test.to_csv(test_input_csv_path, index=False)
+    processed_df = process_data(test_input_csv_path)
+    assert processed_df is not None
+
+    output_csv_path = os.path.join(temp_data_dir, "data", "processed_output.csv")
+    pyarrow_writer = main_module.pa_csv
+    main_module.save_processed_data(processed_df, output_csv_path)
+    with open(output_csv_path, "rb") as f:
+        written = f.read()
+    pd.testing.assert_frame_equal(pd.read_csv(output_csv_path), processed_df, check_dtype=False, check_categorical=False)
+
+    monkeypatch.setattr(main_module, "pa_csv", None)
+    main_module.save_processed_data(processed_df, output_csv_path)
+    with open(output_csv_path, "rb") as f:
+        assert f.read() == written
+
+    needs_quoting_df = processed_df.assign(category="a,b")
+    for writer in (pyarrow_writer, None):
+        monkeypatch.setattr(main_module, "pa_csv", writer)
+        main_module.save_processed_data(needs_quoting_df, output_csv_path)
+        pd.testing.assert_frame_equal(pd.read_csv(output_csv_path), needs_quoting_df, check_dtype=False, check_categorical=False)
+
+
+def test_read_input_csv_applies_schema_without_pyarrow(sample_df_for_test: pd.DataFrame, tmp_path, monkeypatch):
+    monkeypatch.setattr(main_module, "pa_ds", None)
+    input_csv_path = tmp_path / "input.csv"
+    sample_df_for_test.assign(unused="x").to_csv(input_csv_path, index=False)
+
+    df = main_module._read_input_csv(str(input_csv_path), main_module.VALUE1_MIN)
+    assert list(df.columns) == ["id", "category", "value1", "value2"]
+    assert pd.api.types.is_string_dtype(df["category"])
+    assert df["value1"].dtype == "Int64"
+
+
+def test_setup_logging_writes_through_queue_listener(temp_data_dir: str):
+    root = logging.getLogger()
+    saved_root_handlers, saved_root_level = root.handlers[:], root.level
+    saved_handlers, saved_level = main_module.logger.handlers[:], main_module.logger.level
+    # Start from an unconfigured tree; otherwise setup_logging sees pytest's/conftest's handlers and does nothing.
+    root.handlers = []
+    main_module.logger.handlers = []
+    listener = None
+    try:
+        listener = main_module.setup_logging()
+        assert listener is not None
+        assert len(root.handlers) == 1
+        assert isinstance(root.handlers[0], logging.handlers.QueueHandler)
+
+        main_module.logger.debug("debug record")
+        main_module.logger.info("info record")
+    finally:
+        if listener is not None:
+            listener.stop()  # Drains the queue into the file handler
+            atexit.unregister(listener.stop)
+            for handler in listener.handlers:
+                handler.close()
+        root.handlers = saved_root_handlers
+        root.setLevel(saved_root_level)
+        main_module.logger.handlers = saved_handlers
+        main_module.logger.setLevel(saved_level)
+
+    with open(main_module.get_default_log_path(), encoding="utf-8") as f:
+        log_lines = f.read().splitlines()
+    timestamp = r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}"
+    assert len(log_lines) == 2
+    assert re.fullmatch(timestamp + r" - main - DEBUG - debug record", log_lines[0])
+    assert re.fullmatch(timestamp + r" - main - INFO - info record", log_lines[1])